@@ -2,6 +2,19 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.parsers import JSONParser
+from django.conf import settings
+from django.core.cache import cache
+import hashlib
+
+
+def _query_cache_key(query):
+    """
+    Cache key for a query response, normalized so trivially different
+    phrasings of the same query (case, surrounding whitespace) hit the
+    same entry.
+    """
+    normalized = query.lower().strip()
+    return 'query:' + hashlib.sha256(normalized.encode()).hexdigest()
 
 
 class QueryView(APIView):
@@ -14,26 +27,39 @@ class QueryView(APIView):
     def post(self, request):
         """
         Process a legal query and return answer with citations.
-        
+
         Expected request body:
         {
             "query": "What is the penalty for..."
         }
         """
         query = request.data.get('query')
-        
+
         if not query:
             return Response(
                 {'error': 'Query is required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
+
+        # Exact-match cache tier: legal queries repeat heavily across
+        # users, and a hit skips the retrieval + LLM pipeline entirely.
+        # A semantic (embedding-similarity) tier can be layered in here
+        # once the retrieval pipeline lands.
+        cache_key = _query_cache_key(query)
+        cached_response = cache.get(cache_key)
+        if cached_response is not None:
+            return Response(cached_response, status=status.HTTP_200_OK)
+
         # TODO: Implement query processing logic
         # This will be implemented in the next phase
-        
-        return Response({
+
+        response_data = {
             'answer': 'This is a placeholder response. Query processing will be implemented.',
             'citations': [],
             'confidence_score': 0.0,
             'query': query
-        }, status=status.HTTP_200_OK)
+        }
+
+        cache.set(cache_key, response_data, timeout=settings.QUERY_CACHE_TIMEOUT)
+
+        return Response(response_data, status=status.HTTP_200_OK)
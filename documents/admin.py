@@ -16,3 +16,8 @@ class DocumentChunkAdmin(admin.ModelAdmin):
     list_filter = ['document', 'page_number']
     search_fields = ['chunk_text', 'document__name']
     readonly_fields = ['id', 'created_at']
+
+    def get_queryset(self, request):
+        # list_display shows the related document; join it up front to
+        # avoid one Document SELECT per row
+        return super().get_queryset(request).select_related('document')
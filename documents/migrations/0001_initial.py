@@ -0,0 +1,68 @@
+# Generated by Django 4.2.7 on 2026-09-01 09:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Document',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('file', models.FileField(upload_to='documents/')),
+                ('file_size', models.BigIntegerField()),
+                ('uploaded_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('chunks_indexed', models.IntegerField(default=0)),
+                ('error_message', models.TextField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-uploaded_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DocumentChunk',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('chunk_text', models.TextField()),
+                ('chunk_index', models.IntegerField()),
+                ('page_number', models.IntegerField(blank=True, null=True)),
+                ('section', models.CharField(blank=True, max_length=255, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='documents.document')),
+            ],
+            options={
+                'ordering': ['document', 'chunk_index'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['status'], name='documents_d_status_07369e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['-uploaded_at'], name='documents_d_uploade_78ffff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documentchunk',
+            index=models.Index(fields=['page_number'], name='documents_d_page_nu_2ab6c8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documentchunk',
+            index=models.Index(fields=['document', 'page_number'], name='documents_d_documen_1a14ec_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='documentchunk',
+            unique_together={('document', 'chunk_index')},
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0001_initial'),
+    ]
+
+    # UNLOGGED staging table for chunk ingestion: tasks COPY rows here
+    # (no WAL, no indexes) and then move them into documentchunk with a
+    # single INSERT-SELECT. Schema mirrors documentchunk minus
+    # constraints and indexes.
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE UNLOGGED TABLE documents_documentchunk_staging (
+                    id uuid NOT NULL,
+                    document_id uuid NOT NULL,
+                    chunk_text text NOT NULL,
+                    chunk_index integer NOT NULL,
+                    page_number integer NULL,
+                    section varchar(255) NULL,
+                    created_at timestamptz NOT NULL
+                );
+            """,
+            reverse_sql="DROP TABLE documents_documentchunk_staging;",
+        ),
+    ]
@@ -27,7 +27,11 @@ class Document(models.Model):
     
     class Meta:
         ordering = ['-uploaded_at']
-    
+        indexes = [
+            models.Index(fields=['status']),
+            models.Index(fields=['-uploaded_at']),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -47,6 +51,10 @@ class DocumentChunk(models.Model):
     class Meta:
         ordering = ['document', 'chunk_index']
         unique_together = ['document', 'chunk_index']
+        indexes = [
+            models.Index(fields=['page_number']),
+            models.Index(fields=['document', 'page_number']),
+        ]
     
     def __str__(self):
         return f"{self.document.name} - Chunk {self.chunk_index}"
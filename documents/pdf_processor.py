@@ -2,16 +2,34 @@
 PDF text extraction and preprocessing utilities for legal documents.
 """
 
+import multiprocessing
+import os
 import re
 import logging
-from typing import List, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Tuple, Optional, Union
 from io import BytesIO
 
+# A PDF input: filesystem path or binary file-like object (e.g. a
+# BytesIO read from a remote storage backend)
+PDFSource = Union[str, BinaryIO]
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
 try:
     import PyPDF2
 except ImportError:
     PyPDF2 = None
 
+try:
+    import pysbd
+except ImportError:
+    pysbd = None
+
 try:
     from pdfminer.high_level import extract_text as pdfminer_extract_text
     from pdfminer.layout import LAParams
@@ -23,70 +41,240 @@ except ImportError:
 
 logger = logging.getLogger('law_school')
 
+# Precompiled regex patterns (hot path during ingestion; avoid the
+# per-call pattern cache lookup that re.sub/re.search with literals incurs)
+_WHITESPACE_RE = re.compile(r'\s+')
+_HYPHEN_SPLIT_RE = re.compile(r'(\w+)-\s+(\w+)')
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+_SECTION_NUMBER_RE = re.compile(r'Section\s+(\d+(?:\.\d+)*)')
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Rule-based sentence boundary detector; unlike the naive regex split it
+# does not break on abbreviations common in legal text ("U.S.C.", "No.",
+# "Fed. R. Civ. P.", "§ 1.2.")
+_SEGMENTER = pysbd.Segmenter(language='en', clean=False) if pysbd else None
+
+
+def _split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences, preferring pysbd and falling back to the
+    punctuation-lookbehind regex when it is not installed.
+    """
+    if _SEGMENTER is not None:
+        return _SEGMENTER.segment(text)
+    return _SENTENCE_SPLIT_RE.split(text)
+
+# Common legal section patterns
+_SECTION_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in [
+        r'Section\s+(\d+(?:\.\d+)*)',
+        r'§\s*(\d+(?:\.\d+)*)',
+        r'Article\s+(\d+(?:\.\d+)*)',
+        r'Chapter\s+(\d+(?:\.\d+)*)',
+        r'Part\s+(\d+(?:\.\d+)*)',
+    ]
+]
+
+# Punctuation preserved by preprocess_text in addition to word characters
+# and whitespace: periods, commas, colons, semicolons, parentheses,
+# brackets, quotes, dashes
+_KEEP_CHARS = set(".,:;()[]{}'\"-—–_")
+
+
+class _CharFilterTable(dict):
+    """
+    Lazy translation table for str.translate that maps disallowed
+    codepoints to a space. Entries are computed on first sight of each
+    codepoint and cached, so filtering is a single O(N) pass instead of
+    a regex scan.
+    """
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        if char in _KEEP_CHARS or char.isalnum() or char.isspace():
+            self[codepoint] = codepoint
+        else:
+            self[codepoint] = 0x20
+        return self[codepoint]
+
+
+_CHAR_FILTER_TABLE = _CharFilterTable()
+
+
+def _describe_source(source: PDFSource) -> str:
+    """
+    Human-readable identifier for a PDF source in log lines; a BytesIO
+    repr carries no per-document information.
+    """
+    if isinstance(source, str):
+        return source
+    return getattr(source, 'name', None) or '<in-memory PDF>'
+
+
+@contextmanager
+def _open_pdf(source: PDFSource):
+    """
+    Yield a binary file object for a path or file-like source. File-like
+    sources are rewound rather than reopened, and stay open for the
+    caller to reuse.
+    """
+    if hasattr(source, 'read'):
+        source.seek(0)
+        yield source
+    else:
+        with open(source, 'rb') as file:
+            yield file
+
+# Documents below this page count are processed serially; pool startup
+# overhead outweighs the parallelism win for small PDFs
+_MIN_PAGES_FOR_POOL = 8
+
+
+def _process_page(args: Tuple[str, int, int, int]) -> List[dict]:
+    """
+    Preprocess and chunk a single page.
+
+    Module-level (rather than a PDFProcessor method) so it can be
+    dispatched to worker processes by process_pdf.
+
+    Args:
+        args: Tuple of (page_text, page_number, min_chunk_length,
+            max_chunk_length)
+
+    Returns:
+        List of chunk dictionaries for the page (chunk_index is
+        page-local; the caller renumbers globally)
+    """
+    page_text, page_number, min_chunk_length, max_chunk_length = args
+
+    processor = PDFProcessor()
+    processor.min_chunk_length = min_chunk_length
+    processor.max_chunk_length = max_chunk_length
+
+    cleaned_text = processor.preprocess_text(page_text)
+
+    if not cleaned_text or len(cleaned_text.strip()) < min_chunk_length:
+        return []
+
+    section = processor.extract_sections(cleaned_text, page_number)
+
+    return processor.chunk_text(cleaned_text, page_number, section)
+
 
 class PDFProcessor:
     """
     Handles PDF text extraction and preprocessing for legal documents.
+
+    All methods are stateless with respect to the instance, so a single
+    shared instance (see _PROCESSOR below) is safe across tasks and
+    threads.
     """
-    
-    def __init__(self):
-        self.min_chunk_length = 50  # Minimum characters per chunk
-        self.max_chunk_length = 2000  # Maximum characters per chunk
-    
-    def extract_text_from_pdf(self, file_path: str) -> List[Tuple[str, int]]:
+
+    min_chunk_length = 50  # Minimum characters per chunk
+    max_chunk_length = 2000  # Maximum characters per chunk
+
+    def extract_text_from_pdf(self, source: PDFSource, label: Optional[str] = None) -> List[Tuple[str, int]]:
         """
         Extract text from PDF file with page numbers.
-        
+
         Args:
-            file_path: Path to the PDF file
-            
+            source: Path to the PDF file, or a binary file-like object
+            label: Optional human-readable name (e.g. the document name)
+                used in log lines for file-like sources
+
         Returns:
             List of tuples containing (text, page_number)
-            
+
         Raises:
             ValueError: If PDF extraction fails
         """
+        label = label or _describe_source(source)
         pages_text = []
-        
-        # Try PyPDF2 first (faster, good for simple PDFs)
+
+        # Try pypdfium2 first (wraps the PDFium C++ library; much faster
+        # than the pure-Python extractors)
+        if pdfium:
+            try:
+                pages_text = self._extract_with_pdfium(source)
+                if pages_text:
+                    logger.info(f"Successfully extracted text using pypdfium2 from {label}")
+                    return pages_text
+            except Exception as e:
+                logger.warning(f"pypdfium2 extraction failed: {str(e)}, trying PyPDF2...")
+
+        # Fallback to PyPDF2 (pure Python, good for simple PDFs)
         if PyPDF2:
             try:
-                pages_text = self._extract_with_pypdf2(file_path)
+                pages_text = self._extract_with_pypdf2(source)
                 if pages_text:
-                    logger.info(f"Successfully extracted text using PyPDF2 from {file_path}")
+                    logger.info(f"Successfully extracted text using PyPDF2 from {label}")
                     return pages_text
             except Exception as e:
                 logger.warning(f"PyPDF2 extraction failed: {str(e)}, trying pdfminer...")
-        
+
         # Fallback to pdfminer (more robust, handles complex PDFs better)
         if pdfminer_extract_text:
             try:
-                pages_text = self._extract_with_pdfminer(file_path)
+                pages_text = self._extract_with_pdfminer(source)
                 if pages_text:
-                    logger.info(f"Successfully extracted text using pdfminer from {file_path}")
+                    logger.info(f"Successfully extracted text using pdfminer from {label}")
                     return pages_text
             except Exception as e:
                 logger.error(f"pdfminer extraction failed: {str(e)}")
                 raise ValueError(f"Failed to extract text from PDF: {str(e)}")
         
-        raise ValueError("No PDF extraction library available. Please install PyPDF2 or pdfminer.six")
-    
-    def _extract_with_pypdf2(self, file_path: str) -> List[Tuple[str, int]]:
+        raise ValueError("No PDF extraction library available. Please install pypdfium2, PyPDF2 or pdfminer.six")
+
+    def _extract_with_pdfium(self, source: PDFSource) -> List[Tuple[str, int]]:
+        """
+        Extract text using pypdfium2 (PDFium; fastest backend).
+
+        Args:
+            source: Path to the PDF file, or a binary file-like object
+
+        Returns:
+            List of tuples containing (text, page_number)
+        """
+        pages_text = []
+
+        pdf = pdfium.PdfDocument(source)
+        try:
+            for page_num, page in enumerate(pdf, start=1):
+                try:
+                    textpage = page.get_textpage()
+                    text = textpage.get_text_range()
+                    textpage.close()
+                    page.close()
+                    if text.strip():
+                        pages_text.append((text, page_num))
+                except Exception as e:
+                    logger.warning(f"Error extracting page {page_num} with pypdfium2: {str(e)}")
+                    continue
+        finally:
+            pdf.close()
+
+        return pages_text
+
+    def _extract_with_pypdf2(self, source: PDFSource) -> List[Tuple[str, int]]:
         """
         Extract text using PyPDF2 library.
-        
+
         Args:
-            file_path: Path to the PDF file
-            
+            source: Path to the PDF file, or a binary file-like object
+
         Returns:
             List of tuples containing (text, page_number)
         """
         pages_text = []
-        
-        with open(file_path, 'rb') as file:
+
+        # Pages are extracted serially on purpose: PyPDF2's lazy object
+        # resolution seeks the shared stream, so concurrent page reads
+        # through one reader corrupt each other
+        with _open_pdf(source) as file:
             pdf_reader = PyPDF2.PdfReader(file)
             num_pages = len(pdf_reader.pages)
-            
+
             for page_num in range(num_pages):
                 try:
                     page = pdf_reader.pages[page_num]
@@ -96,61 +284,64 @@ class PDFProcessor:
                 except Exception as e:
                     logger.warning(f"Error extracting page {page_num + 1}: {str(e)}")
                     continue
-        
+
         return pages_text
     
-    def _extract_with_pdfminer(self, file_path: str) -> List[Tuple[str, int]]:
+    def _extract_with_pdfminer(self, source: PDFSource) -> List[Tuple[str, int]]:
         """
         Extract text using pdfminer library (more robust for complex PDFs).
-        
+
         Args:
-            file_path: Path to the PDF file
-            
+            source: Path to the PDF file, or a binary file-like object
+
         Returns:
             List of tuples containing (text, page_number)
         """
         pages_text = []
-        
-        with open(file_path, 'rb') as file:
-            # Get PDF pages
-            pages = list(PDFPage.get_pages(file))
-            
-            for page_num, page in enumerate(pages, start=1):
+
+        with _open_pdf(source) as file:
+            # Share one resource manager across pages so its font/XObject
+            # caches survive between pages instead of being rebuilt
+            resource_manager = PDFResourceManager()
+
+            # Configure layout parameters for better text extraction
+            laparams = LAParams(
+                line_margin=0.5,
+                word_margin=0.1,
+                char_margin=2.0,
+                boxes_flow=0.5,
+                all_texts=False
+            )
+
+            # Stream pages lazily instead of materializing them all up front
+            for page_num, page in enumerate(PDFPage.get_pages(file), start=1):
                 try:
-                    # Create resource manager and text converter
-                    resource_manager = PDFResourceManager()
+                    # Converter and output buffer are per-page to capture
+                    # per-page text
                     output_string = BytesIO()
-                    
-                    # Configure layout parameters for better text extraction
-                    laparams = LAParams(
-                        line_margin=0.5,
-                        word_margin=0.1,
-                        char_margin=2.0,
-                        boxes_flow=0.5,
-                        all_texts=False
-                    )
-                    
                     converter = TextConverter(
                         resource_manager,
                         output_string,
                         laparams=laparams
                     )
-                    
-                    # Extract text from page
-                    interpreter = PDFPageInterpreter(resource_manager, converter)
-                    interpreter.process_page(page)
-                    
-                    text = output_string.getvalue().decode('utf-8')
-                    converter.close()
-                    output_string.close()
-                    
+
+                    try:
+                        # Extract text from page
+                        interpreter = PDFPageInterpreter(resource_manager, converter)
+                        interpreter.process_page(page)
+
+                        text = output_string.getvalue().decode('utf-8')
+                    finally:
+                        converter.close()
+                        output_string.close()
+
                     if text.strip():
                         pages_text.append((text, page_num))
-                        
+
                 except Exception as e:
                     logger.warning(f"Error extracting page {page_num} with pdfminer: {str(e)}")
                     continue
-        
+
         return pages_text
     
     def preprocess_text(self, text: str) -> str:
@@ -166,18 +357,11 @@ class PDFProcessor:
         if not text:
             return ""
         
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters but keep legal symbols
-        # Keep: periods, commas, colons, semicolons, parentheses, brackets, quotes, dashes
-        text = re.sub(r'[^\w\s\.\,\:\;\(\)\[\]\{\}\'\"\-\—\–]', ' ', text)
-        
+        # Remove special characters but keep legal symbols, in one pass
+        text = text.translate(_CHAR_FILTER_TABLE)
+
         # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove leading/trailing whitespace
-        text = text.strip()
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         
         # Fix common OCR/text extraction issues
         text = self._fix_common_issues(text)
@@ -194,21 +378,14 @@ class PDFProcessor:
         Returns:
             Fixed text
         """
-        # Fix broken words (common in PDF extraction)
-        text = re.sub(r'(\w+)\s+(\w+)', lambda m: m.group(1) + ' ' + m.group(2) if len(m.group(1)) > 1 and len(m.group(2)) > 1 else m.group(0), text)
-        
         # Fix hyphenated words split across lines
-        text = re.sub(r'(\w+)-\s+(\w+)', r'\1\2', text)
-        
+        text = _HYPHEN_SPLIT_RE.sub(r'\1\2', text)
+
         # Normalize multiple spaces
-        text = re.sub(r' {2,}', ' ', text)
-        
-        # Fix common legal document formatting
-        # Preserve section numbers (e.g., "Section 1.2.3")
-        text = re.sub(r'Section\s+(\d+(?:\.\d+)*)', r'Section \1', text)
-        
-        # Preserve paragraph numbers (e.g., "(a)", "(1)", "(i)")
-        text = re.sub(r'\(([a-z0-9]+)\)', r'(\1)', text)
+        text = _MULTI_SPACE_RE.sub(' ', text)
+
+        # Normalize section numbers (e.g., "Section 1.2.3")
+        text = _SECTION_NUMBER_RE.sub(r'Section \1', text)
         
         return text
     
@@ -223,17 +400,8 @@ class PDFProcessor:
         Returns:
             Section identifier if found, None otherwise
         """
-        # Common legal section patterns
-        section_patterns = [
-            r'Section\s+(\d+(?:\.\d+)*)',
-            r'§\s*(\d+(?:\.\d+)*)',
-            r'Article\s+(\d+(?:\.\d+)*)',
-            r'Chapter\s+(\d+(?:\.\d+)*)',
-            r'Part\s+(\d+(?:\.\d+)*)',
-        ]
-        
-        for pattern in section_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _SECTION_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return match.group(0)
         
@@ -255,112 +423,162 @@ class PDFProcessor:
             return []
         
         chunks = []
-        
+
         # Split by sentences first (better for legal documents)
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        
-        current_chunk = ""
+        sentences = _split_sentences(text)
+
+        # Accumulate sentences in a list and join once per chunk; repeated
+        # string concatenation would make this O(N^2) in chunk size
+        current_parts = []
+        current_len = 0  # length of ' '.join(current_parts)
         chunk_index = 0
-        
+
         for sentence in sentences:
             sentence = sentence.strip()
             if not sentence:
                 continue
-            
+
             # If adding this sentence would exceed max length, save current chunk
-            if current_chunk and len(current_chunk) + len(sentence) + 1 > self.max_chunk_length:
-                if len(current_chunk.strip()) >= self.min_chunk_length:
+            if current_parts and current_len + len(sentence) + 1 > self.max_chunk_length:
+                chunk = ' '.join(current_parts)
+                if len(chunk) >= self.min_chunk_length:
                     chunks.append({
-                        'text': current_chunk.strip(),
+                        'text': chunk,
                         'page_number': page_number,
                         'section': section,
                         'chunk_index': chunk_index
                     })
                     chunk_index += 1
-                current_chunk = sentence
+                current_parts = [sentence]
+                current_len = len(sentence)
             else:
                 # Add sentence to current chunk
-                if current_chunk:
-                    current_chunk += " " + sentence
+                if current_parts:
+                    current_len += len(sentence) + 1
                 else:
-                    current_chunk = sentence
-            
-            # If a single sentence exceeds max length, split it
-            if len(current_chunk) > self.max_chunk_length:
-                # Split by words
-                words = current_chunk.split()
-                temp_chunk = ""
-                
+                    current_len = len(sentence)
+                current_parts.append(sentence)
+
+            # If a single sentence exceeds max length, split it by words
+            if current_len > self.max_chunk_length:
+                words = ' '.join(current_parts).split()
+                temp_parts = []
+                temp_len = 0
+
                 for word in words:
-                    if temp_chunk and len(temp_chunk) + len(word) + 1 > self.max_chunk_length:
-                        if len(temp_chunk.strip()) >= self.min_chunk_length:
+                    if temp_parts and temp_len + len(word) + 1 > self.max_chunk_length:
+                        chunk = ' '.join(temp_parts)
+                        if len(chunk) >= self.min_chunk_length:
                             chunks.append({
-                                'text': temp_chunk.strip(),
+                                'text': chunk,
                                 'page_number': page_number,
                                 'section': section,
                                 'chunk_index': chunk_index
                             })
                             chunk_index += 1
-                        temp_chunk = word
+                        temp_parts = [word]
+                        temp_len = len(word)
                     else:
-                        temp_chunk += " " + word if temp_chunk else word
-                
-                current_chunk = temp_chunk
-        
+                        if temp_parts:
+                            temp_len += len(word) + 1
+                        else:
+                            temp_len = len(word)
+                        temp_parts.append(word)
+
+                current_parts = temp_parts
+                current_len = temp_len
+
         # Add remaining chunk
-        if current_chunk and len(current_chunk.strip()) >= self.min_chunk_length:
-            chunks.append({
-                'text': current_chunk.strip(),
-                'page_number': page_number,
-                'section': section,
-                'chunk_index': chunk_index
-            })
-        
+        if current_parts:
+            chunk = ' '.join(current_parts)
+            if len(chunk) >= self.min_chunk_length:
+                chunks.append({
+                    'text': chunk,
+                    'page_number': page_number,
+                    'section': section,
+                    'chunk_index': chunk_index
+                })
+
         return chunks
     
-    def process_pdf(self, file_path: str) -> List[dict]:
+    def iter_chunks(self, source: PDFSource, label: Optional[str] = None) -> Iterator[dict]:
         """
         Complete PDF processing pipeline: extract, preprocess, and chunk.
-        
+
+        Chunks are yielded one at a time so callers can persist them in
+        batches without holding the whole document's chunks in memory.
+
         Args:
-            file_path: Path to the PDF file
-            
-        Returns:
-            List of chunk dictionaries ready for embedding
+            source: Path to the PDF file, or a binary file-like object
+            label: Optional human-readable name (e.g. the document name)
+                used in log lines for file-like sources
+
+        Yields:
+            Chunk dictionaries ready for embedding, in page order with
+            globally consecutive chunk indices
         """
-        logger.info(f"Starting PDF processing for: {file_path}")
-        
+        label = label or _describe_source(source)
+        logger.info(f"Starting PDF processing for: {label}")
+
         # Extract text with page numbers
-        pages_text = self.extract_text_from_pdf(file_path)
-        
+        pages_text = self.extract_text_from_pdf(source, label=label)
+
         if not pages_text:
-            logger.warning(f"No text extracted from PDF: {file_path}")
-            return []
-        
-        all_chunks = []
+            logger.warning(f"No text extracted from PDF: {label}")
+            return
+
+        page_args = [
+            (page_text, page_number, self.min_chunk_length, self.max_chunk_length)
+            for page_text, page_number in pages_text
+        ]
+
+        # Preprocessing and chunking are CPU-bound and independent per
+        # page; farm them out to a process pool for large documents.
+        # Celery's default prefork pool runs tasks in daemonic worker
+        # processes, which are not allowed to spawn children, so inside
+        # such a worker we must stay on the serial path.
+        executor = None
+        use_pool = (
+            len(page_args) >= _MIN_PAGES_FOR_POOL
+            and not multiprocessing.current_process().daemon
+        )
+        if use_pool:
+            executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+            page_results = executor.map(_process_page, page_args, chunksize=4)
+        else:
+            page_results = map(_process_page, page_args)
+
         global_chunk_index = 0
-        
-        # Process each page
-        for page_text, page_number in pages_text:
-            # Preprocess text
-            cleaned_text = self.preprocess_text(page_text)
-            
-            if not cleaned_text or len(cleaned_text.strip()) < self.min_chunk_length:
-                continue
-            
-            # Extract section identifier
-            section = self.extract_sections(cleaned_text, page_number)
-            
-            # Chunk the text
-            page_chunks = self.chunk_text(cleaned_text, page_number, section)
-            
-            # Update global chunk indices
-            for chunk in page_chunks:
-                chunk['chunk_index'] = global_chunk_index
-                global_chunk_index += 1
-            
-            all_chunks.extend(page_chunks)
-        
-        logger.info(f"Processed PDF: {len(pages_text)} pages, {len(all_chunks)} chunks created")
-        
-        return all_chunks
+
+        # Consume in page order and renumber chunk indices globally
+        try:
+            for page_chunks in page_results:
+                for chunk in page_chunks:
+                    chunk['chunk_index'] = global_chunk_index
+                    global_chunk_index += 1
+                    yield chunk
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        logger.info(f"Processed PDF: {len(pages_text)} pages, {global_chunk_index} chunks created")
+
+    def process_pdf(self, source: PDFSource, label: Optional[str] = None) -> List[dict]:
+        """
+        Materialized form of iter_chunks for callers that want the full
+        chunk list.
+
+        Args:
+            source: Path to the PDF file, or a binary file-like object
+            label: Optional human-readable name (e.g. the document name)
+                used in log lines for file-like sources
+
+        Returns:
+            List of chunk dictionaries ready for embedding
+        """
+        return list(self.iter_chunks(source, label=label))
+
+
+# Shared instance for task code; PDFProcessor is stateless so one
+# instance can serve every Celery task in the worker
+_PROCESSOR = PDFProcessor()
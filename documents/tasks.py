@@ -1,59 +1,168 @@
 from celery import shared_task
 from django.conf import settings
+from django.db import OperationalError, connection, transaction
 from django.utils import timezone
 from .models import Document, DocumentChunk
-from .pdf_processor import PDFProcessor
+from .pdf_processor import _PROCESSOR
+import csv
+import io
 import logging
-import os
+from itertools import islice
 
 logger = logging.getLogger('law_school')
 
+# Batch size for chunk inserts (bulk_create and COPY alike)
+CHUNK_INSERT_BATCH_SIZE = 500
 
-@shared_task(bind=True, max_retries=3)
-def process_document_task(self, document_id):
+# UNLOGGED staging table for chunk ingestion (see 0002 migration).
+# COPY into the unindexed, WAL-free staging table is cheap; the final
+# INSERT-SELECT builds the real table's indexes in one bulk pass.
+CHUNK_STAGING_TABLE = 'documents_documentchunk_staging'
+
+_CHUNK_COLUMNS = (
+    'id', 'document_id', 'chunk_text', 'chunk_index',
+    'page_number', 'section', 'created_at'
+)
+
+
+def _using_postgres():
+    return 'postgres' in settings.DATABASES['default']['ENGINE']
+
+
+def _save_chunks(chunk_objects):
+    """
+    Persist unsaved DocumentChunk instances as efficiently as possible.
+
+    On Postgres, rows are streamed into the UNLOGGED staging table via
+    COPY FROM STDIN, which avoids per-row parameter binding and per-row
+    WAL; the caller must flush the staging table into documentchunk
+    with _flush_chunk_staging once all batches are staged. Otherwise
+    falls back to bulk_create directly into documentchunk.
+    """
+    if _using_postgres():
+        created_at = timezone.now().isoformat()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for chunk in chunk_objects:
+            writer.writerow([
+                chunk.id,
+                chunk.document_id,
+                chunk.chunk_text,
+                chunk.chunk_index,
+                chunk.page_number,
+                chunk.section,
+                created_at,
+            ])
+        buffer.seek(0)
+
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                'COPY {} ({}) FROM STDIN WITH (FORMAT csv)'.format(
+                    CHUNK_STAGING_TABLE, ', '.join(_CHUNK_COLUMNS)
+                ),
+                buffer
+            )
+    else:
+        DocumentChunk.objects.bulk_create(chunk_objects, batch_size=CHUNK_INSERT_BATCH_SIZE)
+
+
+def _mark_failed(document_id, exc):
+    """
+    Record a processing failure on the Document, swallowing errors so
+    the original exception stays the one reported.
+    """
+    try:
+        # Targeted UPDATE; no need to load the row just to mark it failed
+        Document.objects.filter(id=document_id).update(
+            status='failed',
+            error_message=str(exc)
+        )
+    except Exception:
+        pass
+
+
+def _flush_chunk_staging(document_id):
+    """
+    Move a document's staged chunks into documentchunk in one
+    INSERT-SELECT, then clear them from the staging table.
+
+    No-op on non-Postgres backends, where _save_chunks writes directly.
+    """
+    if not _using_postgres():
+        return
+
+    columns = ', '.join(_CHUNK_COLUMNS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO documents_documentchunk ({columns}) '
+            'SELECT {columns} FROM {staging} WHERE document_id = %s'.format(
+                columns=columns, staging=CHUNK_STAGING_TABLE
+            ),
+            [document_id]
+        )
+        cursor.execute(
+            'DELETE FROM {} WHERE document_id = %s'.format(CHUNK_STAGING_TABLE),
+            [document_id]
+        )
+
+
+@shared_task(autoretry_for=(OperationalError, IOError), max_retries=3, default_retry_delay=60)
+def process_document_task(document_id):
     """
     Background task to process uploaded document.
     This will extract text, chunk it, generate embeddings, and store in FAISS.
+
+    Relies on CONN_MAX_AGE in settings so workers reuse their Postgres
+    connection across tasks instead of reconnecting per document.
     """
     try:
-        document = Document.objects.get(id=document_id)
+        # Only fetch what the happy path needs; error_message can hold
+        # large tracebacks and the failure path re-fetches the full row
+        document = Document.objects.only('id', 'name', 'file', 'status').get(id=document_id)
         document.status = 'processing'
-        document.save()
+        document.save(update_fields=['status'])
         
         logger.info(f"Starting processing for document: {document.name} (ID: {document_id})")
-        
-        # Get the file path
-        file_path = document.file.path
-        
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"PDF file not found at: {file_path}")
-        
-        # Initialize PDF processor
-        processor = PDFProcessor()
-        
+
+        # Read through the storage API rather than FileField.path, which
+        # does not exist for remote backends (S3/GCS)
+        with document.file.open('rb') as file:
+            pdf_buffer = io.BytesIO(file.read())
+
         # Process PDF: extract, preprocess, and chunk text
-        chunks_data = processor.process_pdf(file_path)
-        
-        if not chunks_data:
-            raise ValueError("No text could be extracted from the PDF")
-        
-        # Save chunks to database
-        chunks_created = 0
-        for chunk_data in chunks_data:
-            DocumentChunk.objects.create(
-                document=document,
-                chunk_text=chunk_data['text'],
-                chunk_index=chunk_data['chunk_index'],
-                page_number=chunk_data.get('page_number'),
-                section=chunk_data.get('section')
-            )
-            chunks_created += 1
-        
-        # Update document status
-        document.status = 'completed'
-        document.chunks_indexed = chunks_created
-        document.processed_at = timezone.now()
-        document.save()
+        # (shared processor instance; PDFProcessor is stateless)
+        chunk_iter = _PROCESSOR.iter_chunks(pdf_buffer, label=document.name)
+
+        with transaction.atomic():
+            # Stream chunks into the database in batches so peak memory
+            # stays O(batch) rather than O(document)
+            chunks_created = 0
+            while True:
+                batch = list(islice(chunk_iter, CHUNK_INSERT_BATCH_SIZE))
+                if not batch:
+                    break
+                _save_chunks([
+                    DocumentChunk(
+                        document=document,
+                        chunk_text=chunk_data['text'],
+                        chunk_index=chunk_data['chunk_index'],
+                        page_number=chunk_data.get('page_number'),
+                        section=chunk_data.get('section')
+                    )
+                    for chunk_data in batch
+                ])
+                chunks_created += len(batch)
+
+            if chunks_created == 0:
+                raise ValueError("No text could be extracted from the PDF")
+
+            _flush_chunk_staging(document.id)
+
+            # Update document status
+            document.status = 'completed'
+            document.chunks_indexed = chunks_created
+            document.processed_at = timezone.now()
+            document.save(update_fields=['status', 'chunks_indexed', 'processed_at'])
         
         logger.info(
             f"Completed processing for document: {document.name}. "
@@ -67,19 +176,27 @@ def process_document_task(self, document_id):
         }
         
     except Document.DoesNotExist:
+        # The row is gone; there is nothing to mark failed and retrying
+        # cannot bring it back
         logger.error(f"Document not found: {document_id}")
-        raise
+        return {
+            'document_id': str(document_id),
+            'status': 'failed'
+        }
+    except (ValueError, FileNotFoundError) as exc:
+        # Permanent failures (unreadable PDF, missing file): retrying
+        # would burn three minutes per worker for the same result
+        logger.error(f"Error processing document {document_id}: {str(exc)}", exc_info=True)
+        _mark_failed(document_id, exc)
+        return {
+            'document_id': str(document_id),
+            'status': 'failed',
+            'error': str(exc)
+        }
     except Exception as exc:
+        # Transient errors (OperationalError, IOError) are retried by
+        # autoretry_for after this handler re-raises; anything else
+        # fails the task outright
         logger.error(f"Error processing document {document_id}: {str(exc)}", exc_info=True)
-        
-        # Update document status to failed
-        try:
-            document = Document.objects.get(id=document_id)
-            document.status = 'failed'
-            document.error_message = str(exc)
-            document.save()
-        except:
-            pass
-        
-        # Retry the task
-        raise self.retry(exc=exc, countdown=60)
+        _mark_failed(document_id, exc)
+        raise
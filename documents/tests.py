@@ -0,0 +1,62 @@
+from django.test import SimpleTestCase
+
+from .pdf_processor import PDFProcessor
+
+
+class PreprocessTextTests(SimpleTestCase):
+    """
+    Pin preprocess_text behavior on representative extracted text, so
+    cleanup work in the preprocessing passes cannot silently change
+    what the chunking pipeline receives.
+    """
+
+    def setUp(self):
+        self.processor = PDFProcessor()
+
+    def test_empty_input_returns_empty_string(self):
+        self.assertEqual(self.processor.preprocess_text(''), '')
+        self.assertEqual(self.processor.preprocess_text(None), '')
+
+    def test_collapses_whitespace_runs(self):
+        self.assertEqual(
+            self.processor.preprocess_text('Some   text\n\twith \x0cbroken\r\nlayout'),
+            'Some text with broken layout'
+        )
+
+    def test_strips_disallowed_characters_keeping_legal_punctuation(self):
+        self.assertEqual(
+            self.processor.preprocess_text('Fees: (a) $100; [see 1.2], "quoted" — dash.'),
+            'Fees: (a) 100; [see 1.2], "quoted" — dash.'
+        )
+
+    def test_joins_hyphenated_words_split_across_lines(self):
+        self.assertEqual(
+            self.processor.preprocess_text('the parties agree to co-\noperation in good faith'),
+            'the parties agree to cooperation in good faith'
+        )
+
+    def test_normalizes_section_numbers(self):
+        self.assertEqual(
+            self.processor.preprocess_text('Section   1.2.3 shall apply'),
+            'Section 1.2.3 shall apply'
+        )
+
+    def test_preserves_paragraph_markers(self):
+        self.assertEqual(
+            self.processor.preprocess_text('under subsections (a), (1) and (iv)'),
+            'under subsections (a), (1) and (iv)'
+        )
+
+    def test_representative_extracted_page(self):
+        raw = (
+            'Section  4.1   Indemnification.\n'
+            'Each party shall • indemnify the other against losses\x0c'
+            'arising under 18 U.S.C. 1951, includ-\ning reasonable fees; '
+            'see paragraph (b)(2).'
+        )
+        self.assertEqual(
+            self.processor.preprocess_text(raw),
+            'Section 4.1 Indemnification. Each party shall indemnify the '
+            'other against losses arising under 18 U.S.C. 1951, including '
+            'reasonable fees; see paragraph (b)(2).'
+        )
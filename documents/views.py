@@ -1,6 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import generics, status
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.conf import settings
 from .models import Document
@@ -43,7 +44,18 @@ class DocumentUploadView(APIView):
                 {'error': f'File size exceeds maximum allowed size of {settings.MAX_UPLOAD_SIZE} bytes'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
+
+        # Validate PDF magic bytes; a renamed non-PDF would otherwise be
+        # accepted here and burn Celery worker time on doomed extraction
+        # attempts
+        header = uploaded_file.read(5)
+        uploaded_file.seek(0)
+        if header != b'%PDF-':
+            return Response(
+                {'error': 'File is not a valid PDF'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         # Create document record
         document = Document.objects.create(
             name=uploaded_file.name,
@@ -64,16 +76,18 @@ class DocumentUploadView(APIView):
         }, status=status.HTTP_201_CREATED)
 
 
-class DocumentListView(APIView):
+class DocumentPagination(PageNumberPagination):
+    page_size = 50
+
+
+class DocumentListView(generics.ListAPIView):
     """
-    API endpoint to list all documents.
+    API endpoint to list all documents, paginated.
     GET /api/v1/documents/
     """
-    
-    def get(self, request):
-        documents = Document.objects.all()
-        serializer = DocumentSerializer(documents, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    queryset = Document.objects.order_by('-uploaded_at')
+    serializer_class = DocumentSerializer
+    pagination_class = DocumentPagination
 
 
 class DocumentDetailView(APIView):